@@ -3,6 +3,8 @@
 # by Furkan Ercevik
 # Started 4 November 2021
 #
+from collections import deque
+import heapq
 import itertools
 from pathlib import Path
 from pathlib import PurePath
@@ -20,6 +22,10 @@ pygame.display.set_caption("VPath - Pathfinder Visualizer")
 COLORS = {"START": (10, 17, 114), "WHITE": (255, 255, 255), "BLACK": (0, 0, 0), "RED": (255, 0, 0),
           "FOUND": (72, 170, 173), "FRONTIER": (1, 96, 100), "PATH": (130, 238, 253)}
 DELAY = 0.004
+LANDMARKS = 8
+# Default latency budget in seconds and inflation schedule of the anytime A* algorithm
+ANYTIME_BUDGET = 0.01
+EPSILON, EPSILON_STEP = 3.0, 0.5
 
 
 def time_it(method):
@@ -37,6 +43,31 @@ def time_it(method):
     return wrapper_time_it
 
 
+def bresenham(start: tuple, end: tuple) -> list:
+    """
+    Rasterizes the line between two cells using Bresenham's line algorithm
+    :param start: tuple of row and col indices to start from
+    :param end: tuple of row and col indices to end at
+    :return: list of the cells on the line, including both ends
+    """
+    r, c = start
+    dr, dc = abs(end[0] - r), -abs(end[1] - c)
+    sr = 1 if r < end[0] else -1
+    sc = 1 if c < end[1] else -1
+    err = dr + dc
+    cells = [(r, c)]
+    while (r, c) != end:
+        e2 = 2 * err
+        if e2 >= dc:
+            err += dc
+            r += sr
+        if e2 <= dr:
+            err += dr
+            c += sc
+        cells.append((r, c))
+    return cells
+
+
 # The Graph class will be used to organize all the Node objects in one place and simulate the visualization process
 class Graph(object):
 
@@ -50,6 +81,9 @@ class Graph(object):
         self.start_pos = None
         self.drag = False
         self.clear_drag = False
+        # Last cell painted in the current stroke and the latest cursor position that has not been painted yet
+        self.last_cell = None
+        self.pending_pos = None
 
         self.MAX_ROWS = 32
         self.MAX_COLS = 40
@@ -65,34 +99,64 @@ class Graph(object):
             x = 0
             y += 25
 
+        # Wall nodes and nodes recolored by the last search, so clearing only has to touch those
+        self.walls = set()
+        self.dirty = set()
+        # Nodes that changed since the last frame, or whether the whole grid has to be redrawn
+        self.changed = set()
+        self.full_redraw = True
+        # Reusable search buffers for the forward and backward directions
+        self.fwd = SearchBuffer(self.MAX_ROWS, self.MAX_COLS)
+        self.bwd = SearchBuffer(self.MAX_ROWS, self.MAX_COLS)
+        # ALT heuristic mode and the cached landmark distance tables, recomputed lazily after the walls change
+        self.use_alt = False
+        self.landmarks = None
+
     def clear_graph(self) -> None:
         """
         Clears the graph to its original state
         :return:
         """
         self.clear_visualization()
+        if self.start_pos:
+            n = self.nodes[self.start_pos[0]][self.start_pos[1]]
+            n.toggle_start()
+            self.changed.add(n)
+        if self.dest_pos:
+            n = self.nodes[self.dest_pos[0]][self.dest_pos[1]]
+            n.toggle_dest()
+            self.changed.add(n)
         self.start_pos = None
         self.dest_pos = None
-        for r, row in enumerate(self.nodes):
-            for c, col in enumerate(row):
-                n = self.nodes[r][c]
-                if n.dest:
-                    n.toggle_dest()
-                if n.start:
-                    n.toggle_start()
-                if n.wall_status():
-                    n.toggle_wall()
+        for n in list(self.walls):
+            self.toggle_wall(n)
 
     def clear_visualization(self) -> None:
         """
-        Clears the visualization, returning it to the prior state of the Graph
+        Clears the visualization, returning it to the prior state of the Graph. Only the nodes recolored since the
+        last clear are visited
         :return: None
         """
-        for r, row in enumerate(self.nodes):
-            for c, col in enumerate(row):
-                n = self.nodes[r][c]
-                if not n.wall_status():
-                    n.change_color(COLORS["WHITE"])
+        for n in self.dirty:
+            if not n.wall_status():
+                n.change_color(COLORS["WHITE"])
+        self.changed.update(self.dirty)
+        self.dirty.clear()
+
+    def toggle_wall(self, node) -> None:
+        """
+        Toggles the wall status of a node and keeps track of the walls in the graph
+        :param node: node to be toggled
+        :return: None
+        """
+        node.toggle_wall()
+        self.changed.add(node)
+        if node.wall_status():
+            self.walls.add(node)
+        else:
+            self.walls.discard(node)
+        # The landmark distances are no longer exact
+        self.landmarks = None
 
     def handle_event(self, event: pygame.event) -> None:
         """
@@ -109,6 +173,7 @@ class Graph(object):
             # Clear graph
             if event.key == pygame.K_c:
                 self.clear_graph()
+                self.refresh_landmarks()
             # Call one of the search algorithms
             if event.key == pygame.K_e:
                 self.double_dijkstra()
@@ -118,6 +183,14 @@ class Graph(object):
                 self.a_star_solve()
             if event.key == pygame.K_q:
                 self.double_a_star()
+            if event.key == pygame.K_w:
+                self.anytime_solve()
+            # Toggle the ALT landmark heuristic for the A* algorithms
+            if event.key == pygame.K_l:
+                self.use_alt = not self.use_alt
+                self.refresh_landmarks()
+                print("", end="\r")
+                print(f"ALT landmark heuristic {'enabled' if self.use_alt else 'disabled'}", end="")
             # Clear visualization
             if event.key == pygame.K_v:
                 self.clear_visualization()
@@ -131,6 +204,7 @@ class Graph(object):
                     if (not self.start_pos or self.start_pos == (r, c)) and not node.wall_status():
                         self.clear_visualization()
                         node.toggle_start()
+                        self.changed.add(node)
                         self.start_pos = (r, c) if node.start else None
             # Make the node a destination node
             if event.key == pygame.K_d:
@@ -142,6 +216,7 @@ class Graph(object):
                     if (not self.dest_pos or self.dest_pos == (r, c)) and not node.wall_status():
                         self.clear_visualization()
                         node.toggle_dest()
+                        self.changed.add(node)
                         self.dest_pos = (r, c) if node.dest else None
 
         # Check for mouse clicks
@@ -154,42 +229,74 @@ class Graph(object):
                 if event.button == pygame.BUTTON_LEFT:
                     if not node.wall_status() and not(node.start or node.dest):
                         self.clear_visualization()
-                        node.toggle_wall()
+                        self.toggle_wall(node)
                     self.drag = True
                     self.clear_drag = False
+                    self.last_cell = (r, c)
                 elif event.button == pygame.BUTTON_RIGHT:
                     if node.wall_status():
                         self.clear_visualization()
-                        node.toggle_wall()
+                        self.toggle_wall(node)
                     self.clear_drag = True
                     self.drag = False
+                    self.last_cell = (r, c)
         elif event.type == pygame.MOUSEBUTTONUP:
+            # Finish the stroke before releasing the drag
+            self.paint_stroke()
+            self.refresh_landmarks()
             self.drag = False
             self.clear_drag = False
+            self.last_cell = None
         elif event.type == pygame.MOUSEMOTION:
-            x, y = pygame.mouse.get_pos()
-            if x in range(0, 1025) and y in range(0, 1025):
-                r = y // 25
-                c = x // 25
-                n = self.nodes[r][c]
-                if (n.wall_status() and self.clear_drag) or (not n.wall_status() and self.drag and
-                                                             not (n.start or n.dest)):
-                    n.toggle_wall()
+            # Only remember the latest position, the stroke is painted once per frame
+            if self.drag or self.clear_drag:
+                self.pending_pos = event.pos
+
+    def paint_stroke(self) -> None:
+        """
+        Paints or erases walls along the line from the last painted cell to the latest cursor position. The changed
+        nodes are flushed to the display at once by the next draw
+        :return: None
+        """
+        if not self.pending_pos:
+            return
+        x, y = self.pending_pos
+        self.pending_pos = None
+        r = y // 25
+        c = x // 25
+        if r not in range(self.MAX_ROWS) or c not in range(self.MAX_COLS):
+            return
+
+        for row, col in bresenham(self.last_cell or (r, c), (r, c)):
+            n = self.nodes[row][col]
+            if (n.wall_status() and self.clear_drag) or (not n.wall_status() and self.drag and
+                                                         not (n.start or n.dest)):
+                self.toggle_wall(n)
+        self.last_cell = (r, c)
 
     def draw(self, s):
         """
-        Draws the grid
-        :param s:
-        :return:
+        Draws the nodes that changed since the last call, or the whole grid after a maze load, and updates their
+        region of the display in one call
+        :param s: pygame surface to draw on
+        :return: None
         """
-        for row in self.nodes:
-            for n in row:
-                n.draw(s)
+        if self.full_redraw:
+            for row in self.nodes:
+                for n in row:
+                    n.draw(s, update=False)
+            pygame.display.update()
+        elif self.changed:
+            for n in self.changed:
+                n.draw(s, update=False)
+            pygame.display.update([n.rect for n in self.changed])
+        self.changed.clear()
+        self.full_redraw = False
 
     @time_it
     def dijkstra_solve(self):
         """
-        Creates two dictionaries: one of the distances and of the preceding nodes for each respective node
+        Stores the distances and preceding nodes for each respective node in the forward search buffer
         and backtracks to find the shortest path
         :return: True if a path could be found, otherwise False
         """
@@ -199,15 +306,9 @@ class Graph(object):
         # Once the destination is reached, map the shortest route in red color
         if not self.start_pos or not self.dest_pos:
             return False
-        # Create a dictionary of all the distances
-        # Create a dictionary of all the previous nodes
-        dists = {}
-        prevs = {}
-        for r, row in enumerate(self.nodes):
-            for c, col in enumerate(row):
-                dists[(r, c)] = float('inf')
-                prevs[(r, c)] = None
-        dists[self.start_pos] = 0
+        # Reset the search buffer instead of allocating distances and previous nodes for the whole grid
+        self.fwd.reset()
+        self.fwd.update(self.start_pos, 0, None)
         # Start the dict
         collection = {self.start_pos: 0}
         # While the dict is not empty
@@ -223,16 +324,16 @@ class Graph(object):
             # Get the neighbors of the current node and iterate over them
             neighbors = self.get_adj_nodes(cv[0], cv[1])
             # Call dijkstra's helper method
-            collection, dists, prevs = self.dijkstra_helper(collection, dists, prevs, cv, neighbors)
+            self.dijkstra_helper(collection, self.fwd, cv, neighbors)
 
         # Backtrack from destination node
-        self.backtrack(prevs, self.dest_pos)
+        self.backtrack(self.fwd, self.dest_pos)
 
     @time_it
     def double_dijkstra(self):
         """
-        Creates two pairs of dictionaries: one pair of the distances and of the preceding nodes for each respective node
-        and another pair of distances from the destination position and succeeding nodes
+        Uses two search buffers: one of the distances and preceding nodes for each respective node
+        and another of distances from the destination position and succeeding nodes
         :return: True if a path could be found, otherwise False
         """
         self.clear_visualization()
@@ -241,22 +342,11 @@ class Graph(object):
         # Once the destination is reached, map the shortest route in red color
         if not self.start_pos or not self.dest_pos:
             return
-        # Create dictionaries of all the distances from start_pos and dest_pos
-        # Create dictionaries of all the previous and succeeding nodes
-        dists_s = {}
-        dists_d = {}
-        prevs = {}
-        succs = {}
-
-        for r, row in enumerate(self.nodes):
-            for c, col in enumerate(row):
-                dists_s[(r, c)] = float('inf')
-                dists_d[(r, c)] = float('inf')
-                prevs[(r, c)] = None
-                succs[(r, c)] = None
-
-        dists_s[self.start_pos] = 0
-        dists_d[self.dest_pos] = 0
+        # Reset the search buffers for both directions
+        self.fwd.reset()
+        self.bwd.reset()
+        self.fwd.update(self.start_pos, 0, None)
+        self.bwd.update(self.dest_pos, 0, None)
         # Start the priority queues
         pq_s = {self.start_pos: 0}
         pq_d = {self.dest_pos: 0}
@@ -286,8 +376,8 @@ class Graph(object):
 
             for neighbor_s, neighbor_d in itertools.zip_longest(neighbors_s, neighbors_d):
 
-                diffs = [dist + 1 - dists_s[(neighbor_s.r, neighbor_s.c)] if neighbor_s else 0,
-                         dist_2 + 1 - dists_d[(neighbor_d.r, neighbor_d.c)] if neighbor_d else 0]
+                diffs = [dist + 1 - self.fwd.dist((neighbor_s.r, neighbor_s.c)) if neighbor_s else 0,
+                         dist_2 + 1 - self.bwd.dist((neighbor_d.r, neighbor_d.c)) if neighbor_d else 0]
 
                 # If the new distance is smaller than the original cost put the neighbor in the priority queue with
                 # the new distance cost
@@ -295,26 +385,24 @@ class Graph(object):
                     # Update the color of the neighbor
                     self.draw_updated_node(COLORS["FRONTIER"], neighbor_s)
                     # Update the fastest route of the neighbor
-                    prevs[(neighbor_s.r, neighbor_s.c)] = cv
                     pq_s[(neighbor_s.r, neighbor_s.c)] = dist + 1
-                    dists_s[(neighbor_s.r, neighbor_s.c)] = dist + 1
+                    self.fwd.update((neighbor_s.r, neighbor_s.c), dist + 1, cv)
 
                 if diffs[1] < 0:
                     # Update the color of the neighbor
                     self.draw_updated_node(COLORS["FRONTIER"], neighbor_d)
                     # Update the fastest route of the neighbor
-                    succs[(neighbor_d.r, neighbor_d.c)] = cv_2
                     pq_d[(neighbor_d.r, neighbor_d.c)] = dist_2 + 1
-                    dists_d[(neighbor_d.r, neighbor_d.c)] = dist_2 + 1
+                    self.bwd.update((neighbor_d.r, neighbor_d.c), dist_2 + 1, cv_2)
 
-            # If the vertex from the priority queue starting at the destination exists in the dict of previous nodes
+            # If the vertex from the priority queue starting at the destination has a previous node
             # a shortest path can be found
-            if prevs[cv_2]:
+            if self.fwd.prev(cv_2):
                 inters = cv_2
                 break
 
         # Backtrack bidirectionally
-        self.backtrack_2(prevs, succs, inters)
+        self.backtrack_2(self.fwd, self.bwd, inters)
 
     @time_it
     def a_star_solve(self):
@@ -329,13 +417,10 @@ class Graph(object):
         if not self.start_pos or not self.dest_pos:
             return False
 
-        # Initialize dicts
+        # Initialize the frontier and reset the search buffer
         frontier = {self.start_pos: (0, 0, 0)}
-        found = {}
-        prevs = {}
-        for r, row in enumerate(self.nodes):
-            for c, col in enumerate(row):
-                prevs[(r, c)] = None
+        self.fwd.reset()
+        self.fwd.update(self.start_pos, 0, None)
 
         # While there are nodes in the frontier or the current vertex has not been found yet, continue
         while frontier:
@@ -349,15 +434,14 @@ class Graph(object):
             # If the current vertex is the destination break out of the loop
             if cv == self.dest_pos:
                 break
-            # Otherwise color the current node and add it to the found dict
+            # Otherwise color the current node and mark it as found
             node = self.nodes[cv[0]][cv[1]]
-            found[node] = dist
+            self.fwd.close(cv)
             self.draw_updated_node(COLORS["FOUND"], node)
 
-            frontier, prevs = self.heuristic(prevs, frontier, found, self.get_adj_nodes(cv[0], cv[1]), dist,
-                                             self.dest_pos, cv)
+            self.heuristic(self.fwd, frontier, self.get_adj_nodes(cv[0], cv[1]), dist, self.dest_pos, cv)
         # Initiate backtracking
-        self.backtrack(prevs, self.dest_pos)
+        self.backtrack(self.fwd, self.dest_pos)
 
     @time_it
     def double_a_star(self):
@@ -372,18 +456,13 @@ class Graph(object):
         if not self.start_pos or not self.dest_pos:
             return False
 
-        # Initialize dicts
+        # Initialize the frontiers and reset the search buffers
         s_frontier = {self.start_pos: (0, 0, 0)}
         d_frontier = {self.dest_pos: (0, 0, 0)}
-
-        s_found = {}
-        d_found = {}
-        prevs = {}
-        succs = {}
-        for r, row in enumerate(self.nodes):
-            for c, col in enumerate(row):
-                prevs[(r, c)] = None
-                succs[(r, c)] = None
+        self.fwd.reset()
+        self.bwd.reset()
+        self.fwd.update(self.start_pos, 0, None)
+        self.bwd.update(self.dest_pos, 0, None)
 
         # While there are nodes in the frontier or the current vertex has not been found yet, continue
         crux = None
@@ -400,13 +479,13 @@ class Graph(object):
             del s_frontier[cv]
             del d_frontier[cv_2]
 
-            # Put the current vertices in the found dictionary
+            # Mark the current vertices as found
             s_node = self.nodes[cv[0]][cv[1]]
-            s_found[s_node] = s_dist
+            self.fwd.close(cv)
             self.draw_updated_node(COLORS["FOUND"], s_node)
 
             d_node = self.nodes[cv_2[0]][cv_2[1]]
-            d_found[d_node] = d_dist
+            self.bwd.close(cv_2)
             self.draw_updated_node(COLORS["FOUND"], d_node)
 
             # Get all the neighbors for both current vertices
@@ -414,61 +493,272 @@ class Graph(object):
             d_neighbors = self.get_adj_nodes(cv_2[0], cv_2[1])
 
             # Call helper function
-            s_frontier, prevs = self.heuristic(prevs, s_frontier, s_found, s_neighbors, s_dist, self.dest_pos, cv)
+            self.heuristic(self.fwd, s_frontier, s_neighbors, s_dist, self.dest_pos, cv)
 
-            d_frontier, succs = self.heuristic(succs, d_frontier, d_found, d_neighbors, d_dist, self.start_pos, cv_2)
-            # If the vertex from the priority queue starting at the destination exists in the dict of previous nodes
+            self.heuristic(self.bwd, d_frontier, d_neighbors, d_dist, self.start_pos, cv_2)
+            # If the vertex from the priority queue starting at the destination has a previous node
             # a shortest path can be found
-            if prevs[cv_2]:
+            if self.fwd.prev(cv_2):
                 crux = cv_2
                 break
-        self.backtrack_2(prevs, succs, crux)
+        self.backtrack_2(self.fwd, self.bwd, crux)
+
+    def anytime_solve(self) -> None:
+        """
+        Runs the anytime A* algorithm within the default latency budget and draws the best path it found
+        :return: None
+        """
+        self.clear_visualization()
+        self.draw(screen)
+
+        # If there is no start or end node specified return
+        if not self.start_pos or not self.dest_pos:
+            return
+
+        start_time = time.time()
+        path, bound = self.ara_star(time_limit=ANYTIME_BUDGET)
+        elapsed = time.time() - start_time
+        for r, c in (path or [])[1:-1]:
+            self.draw_updated_node(COLORS["PATH"], node=None, r=r, c=c)
+        print("", end="\r")
+        if path is None:
+            print(f"The anytime search took {elapsed:.3f} seconds, deadline reached before a first path", end="")
+        elif not path:
+            print(f"The anytime search took {elapsed:.3f} seconds and found no path", end="")
+        elif bound == float('inf'):
+            print(f"The anytime search took {elapsed:.3f} seconds, path has no suboptimality bound yet", end="")
+        else:
+            print(f"The anytime search took {elapsed:.3f} seconds, path is within {bound:.2f}x of optimal", end="")
+
+    def ara_star(self, time_limit: float = None, max_expansions: int = None, epsilon: float = EPSILON,
+                 step: float = EPSILON_STEP) -> tuple:
+        """
+        Anytime repairing A* (ARA*). Finds a weighted A* path with an inflated heuristic first, then keeps lowering
+        the inflation factor and repairing the previous search until the path is optimal or the deadline runs out.
+        The deadline covers the whole call: nothing is drawn, and if the landmark tables aren't built the Manhattan
+        distance is used instead of building them
+        :param time_limit: seconds the search may run for, None for no time limit
+        :param max_expansions: number of nodes the search may expand, None for no limit
+        :param epsilon: initial inflation factor of the heuristic
+        :param step: amount the inflation factor is lowered by after each path
+        :return: tuple of the best path found as a list of positions from start_pos to dest_pos and its suboptimality
+        bound. The path is empty if dest_pos can't be reached and None if the deadline ran out before a first path
+        """
+        deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        expansions = 0
+        start, dest = self.start_pos, self.dest_pos
+        buf = self.fwd
+        buf.reset()
+        buf.update(start, 0, None)
+
+        # The open nodes and their g values, the heap of their keys, and the nodes reached again after expansion
+        frontier = {start: 0}
+        h = {start: self.estimate(start, dest, build=False)}
+        heap = [(epsilon * h[start], 0, start)]
+        incons = set()
+        bound = float('inf')
+
+        while True:
+            # Repair the search with the current inflation factor
+            closed = set()
+            while heap:
+                key, dist, cv = heap[0]
+                # Skip stale heap entries
+                if frontier.get(cv) != dist:
+                    heapq.heappop(heap)
+                    continue
+                if buf.dist(dest) <= key:
+                    break
+                if (deadline is not None and time.perf_counter() >= deadline) or \
+                        (max_expansions is not None and expansions >= max_expansions):
+                    return self.get_path(buf, dest) or None, bound
+                heapq.heappop(heap)
+                del frontier[cv]
+                closed.add(cv)
+                expansions += 1
+
+                for n in self.get_adj_nodes(cv[0], cv[1]):
+                    pos = (n.r, n.c)
+                    if dist + 1 >= buf.dist(pos):
+                        continue
+                    buf.update(pos, dist + 1, cv)
+                    if pos in closed:
+                        incons.add(pos)
+                    else:
+                        # The heuristic of a node never changes during the search
+                        if pos not in h:
+                            h[pos] = self.estimate(pos, dest, build=False)
+                        frontier[pos] = dist + 1
+                        heapq.heappush(heap, (dist + 1 + epsilon * h[pos], dist + 1, pos))
+
+            # The destination can't be reached
+            if buf.dist(dest) == float('inf'):
+                return [], bound
+
+            # Tighten the bound with the lowest possible cost of the nodes that still have to be expanded
+            frontier.update((pos, buf.dist(pos)) for pos in incons)
+            incons = set()
+            lower = min((dist + h[pos] for pos, dist in frontier.items()), default=buf.dist(dest))
+            bound = min(epsilon, buf.dist(dest) / lower) if lower else 1.0
+            if bound <= 1:
+                return self.get_path(buf, dest), 1.0
+
+            # Lower the inflation factor and rebuild the heap with the new keys
+            epsilon = max(1.0, epsilon - step)
+            heap = [(dist + epsilon * h[pos], dist, pos) for pos, dist in frontier.items()]
+            heapq.heapify(heap)
 
     # Helper methods for both algorithms
-    def dijkstra_helper(self, queue, dists, prevs, cv, neighbors):
+    def dijkstra_helper(self, queue, buf, cv, neighbors) -> None:
+        """
+        Helper function for Dijkstra's algorithm
+        :param queue: dictionary of all the nodes in the priority queue and their distances
+        :param buf: search buffer holding the distances and preceding nodes
+        :param cv: current vertex
+        :param neighbors: neighbors of the current vertex
+        :return: None
+        """
         for n in neighbors:
-            old_distance = dists[(n.r, n.c)]
-            new_distance = dists[cv] + 1
+            old_distance = buf.dist((n.r, n.c))
+            new_distance = buf.dist(cv) + 1
             # If the new distance is smaller than the original cost put the n in the priority queue with
             # the new distance cost
             if new_distance < old_distance:
                 # Update the color of the n
                 self.draw_updated_node(COLORS["FRONTIER"], n)
                 # Update the fastest route of the n
-                prevs[(n.r, n.c)] = cv
                 queue[(n.r, n.c)] = new_distance
-                dists[(n.r, n.c)] = new_distance
-
-        return queue, dists, prevs
+                buf.update((n.r, n.c), new_distance, cv)
 
-    def heuristic(self, prevs, frontier, found, neighbors, curr_dist, dest, cv) -> tuple:
+    def heuristic(self, buf, frontier, neighbors, curr_dist, dest, cv) -> None:
         """
         Helper function for both A* solve
-        :param prevs: dictionary containing all the nearest preceding nodes to a given node
+        :param buf: search buffer holding the distances, nearest preceding nodes and found nodes
         :param frontier: dictionary of all the nodes in the frontier and their f, g, and h values
-        :param found: dictionary of all nodes and their distances
         :param neighbors: neighbors of the current vertex
         :param curr_dist: distance of the current vertex
         :param dest: destination node
         :param cv: current vertex
-        :return: tuple of updated frontier, prevs
+        :return: None
         """
-        # Iterate over the max 4 neighbors of the current node and update the frontier and prevs dicts accordingly
-        # # If a neighbor was already in frontier but the current route to it is faster update prevs and frontier
-        # # If a neighbor is in found skip it
+        # Iterate over the max 4 neighbors of the current node and update the frontier and search buffer accordingly
+        # # If a neighbor was already reached but the current route to it is faster update the buffer and frontier
+        # # If a neighbor was already found skip it
         for n in neighbors:
-            if n in found or ((n.r, n.c) in frontier and 1 + curr_dist >= frontier[(n.r, n.c)][1]):
+            pos = (n.r, n.c)
+            if buf.is_closed(pos) or 1 + curr_dist >= buf.dist(pos):
                 continue
 
             # Get heuristic value and use it
-            h = abs(dest[0] - n.r) + abs(dest[1] - n.c)
-            frontier[(n.r, n.c)] = (1 + curr_dist + h, 1 + curr_dist, h)
-            prevs[(n.r, n.c)] = cv
+            h = self.estimate(pos, dest)
+            frontier[pos] = (1 + curr_dist + h, 1 + curr_dist, h)
+            buf.update(pos, 1 + curr_dist, cv)
 
             # Draw the neighbor node
             self.draw_updated_node(COLORS["FRONTIER"], n)
 
-        return frontier, prevs
+    def estimate(self, pos: tuple, dest: tuple, build: bool = True) -> int:
+        """
+        Estimates the distance between two positions using the Manhattan distance, tightened by the landmark
+        triangle inequality bounds if the ALT heuristic is enabled
+        :param pos: tuple of the position to estimate from
+        :param dest: tuple of the position to estimate to
+        :param build: whether to build missing landmark tables, otherwise only the Manhattan distance is used
+        :return: lower bound of the distance between the positions
+        """
+        h = abs(dest[0] - pos[0]) + abs(dest[1] - pos[1])
+        if not self.use_alt:
+            return h
+        if self.landmarks is None:
+            if not build:
+                return h
+            self.compute_landmarks()
+        i = pos[0] * self.MAX_COLS + pos[1]
+        j = dest[0] * self.MAX_COLS + dest[1]
+        for table in self.landmarks:
+            # Landmarks that can't reach both positions don't give a bound
+            if table[i] is not None and table[j] is not None:
+                h = max(h, abs(table[j] - table[i]))
+        return h
+
+    def refresh_landmarks(self) -> None:
+        """
+        Rebuilds the landmark tables after the walls changed if the ALT heuristic is enabled, so queries don't have to
+        :return: None
+        """
+        if self.use_alt and self.landmarks is None:
+            self.compute_landmarks()
+
+    def compute_landmarks(self) -> None:
+        """
+        Picks up to LANDMARKS landmarks with farthest-point selection and stores the exact distances from each of them
+        to every node in the graph. Every open region gets a landmark first, largest regions first
+        :return: None
+        """
+        self.landmarks = []
+        cols = self.MAX_COLS
+        # Split the open nodes into regions, each with the distances from an arbitrary node in it
+        regions = []
+        reached = set()
+        for row in self.nodes:
+            for n in row:
+                if n.wall_status() or (n.r, n.c) in reached:
+                    continue
+                table = self.distance_table((n.r, n.c))
+                cells = [(i // cols, i % cols) for i, dist in enumerate(table) if dist is not None]
+                reached.update(cells)
+                regions.append((cells, table))
+        regions.sort(key=lambda t: len(t[0]), reverse=True)
+
+        closest = [None] * (self.MAX_ROWS * cols)
+        covered = []
+        for cells, table in regions:
+            # A landmark in a single node region never gives a bound
+            if len(self.landmarks) == LANDMARKS or len(cells) == 1:
+                break
+            # The first landmark of a region is the node farthest from the arbitrary node
+            self.add_landmark(max(cells, key=lambda t: table[t[0] * cols + t[1]]), closest)
+            covered.extend(cells)
+
+        while len(self.landmarks) < LANDMARKS:
+            # The next landmark is the node farthest from all the landmarks picked so far
+            landmark = max(covered, key=lambda t: closest[t[0] * cols + t[1]], default=None)
+            if landmark is None or closest[landmark[0] * cols + landmark[1]] == 0:
+                # Every covered node is already a landmark
+                break
+            self.add_landmark(landmark, closest)
+
+    def add_landmark(self, landmark: tuple, closest: list) -> None:
+        """
+        Stores the distance table of a landmark and updates the distances to the closest landmark of every node
+        :param landmark: tuple of the position of the landmark
+        :param closest: flat list of the distances from every node to its closest landmark
+        :return: None
+        """
+        table = self.distance_table(landmark)
+        self.landmarks.append(table)
+        for i, dist in enumerate(table):
+            if dist is not None and (closest[i] is None or dist < closest[i]):
+                closest[i] = dist
+
+    def distance_table(self, source: tuple) -> list:
+        """
+        Runs a breadth-first search from a source position
+        :param source: tuple of the position to search from
+        :return: flat list of the distances from the source to every node, None for unreachable nodes
+        """
+        table = [None] * (self.MAX_ROWS * self.MAX_COLS)
+        table[source[0] * self.MAX_COLS + source[1]] = 0
+        queue = deque([source])
+        while queue:
+            r, c = queue.popleft()
+            dist = table[r * self.MAX_COLS + c] + 1
+            for n in self.get_adj_nodes(r, c):
+                i = n.r * self.MAX_COLS + n.c
+                if table[i] is None:
+                    table[i] = dist
+                    queue.append((n.r, n.c))
+        return table
 
     def get_adj_nodes(self, r, c) -> list:
         """
@@ -490,34 +780,44 @@ class Graph(object):
             adjacent.append(n)
         return adjacent
 
-    def backtrack(self, d: dict, start_pos: tuple) -> None:
+    def get_path(self, buf, dest: tuple) -> list:
+        """
+        Follows the preceding nodes in a search buffer back from a destination
+        :param buf: search buffer of parent nodes for each node in the graph
+        :param dest: tuple of the position to backtrack from
+        :return: list of the positions from the source of the search to dest, empty if dest wasn't reached
+        """
+        if buf.dist(dest) == float('inf'):
+            return []
+        path = [dest]
+        while buf.prev(path[-1]):
+            path.append(buf.prev(path[-1]))
+        return path[::-1]
+
+    def backtrack(self, buf, start_pos: tuple) -> None:
         """
-        Draws out the route from the dest_pos to the start_pos using a dict
-        :param d: dict of parent nodes for each node in the graph
+        Draws out the route from the dest_pos to the start_pos using a search buffer
+        :param buf: search buffer of parent nodes for each node in the graph
         :param start_pos: tuple of starting position to backtrack from
         :return: None
         """
-        coors = d[start_pos]
+        coors = buf.prev(start_pos)
         while coors:
-            node = self.nodes[coors[0]][coors[1]]
-            time.sleep(DELAY)
-            node.change_color(COLORS["PATH"])
-            node.draw(screen)
-            coors = d[coors]
+            self.draw_updated_node(COLORS["PATH"], node=None, r=coors[0], c=coors[1])
+            coors = buf.prev(coors)
 
-    def backtrack_2(self, prevs: dict, succs: dict, inters: tuple) -> None:
+    def backtrack_2(self, prevs, succs, inters: tuple) -> None:
         """
         Backtracks bidirectionally from an intersection point
-        :param prevs: dictionary containing parent nodes of nodes in the graph
-        :param succs: dictionary containing children nodes of nodes in the graph
+        :param prevs: search buffer containing parent nodes of nodes in the graph
+        :param succs: search buffer containing children nodes of nodes in the graph
         :param inters: intersection point
         :return: None
         """
-        try:
-            coors_s = prevs[inters]
-            coors_d = succs[inters]
-        except KeyError:
+        if not inters:
             return
+        coors_s = prevs.prev(inters)
+        coors_d = succs.prev(inters)
 
         # Draw the first node
         n = self.nodes[inters[0]][inters[1]]
@@ -527,15 +827,15 @@ class Graph(object):
         while coors_s or coors_d:
             if coors_d:
                 self.draw_updated_node(COLORS["PATH"], node=None, r=coors_d[0], c=coors_d[1])
-                coors_d = succs[coors_d]
+                coors_d = succs.prev(coors_d)
 
             if coors_s:
                 self.draw_updated_node(COLORS["PATH"], node=None, r=coors_s[0], c=coors_s[1])
-                coors_s = prevs[coors_s]
+                coors_s = prevs.prev(coors_s)
 
     def draw_updated_node(self, color: tuple, node=None, r=None, c=None) -> None:
         """
-        Changes the color of a node and updates it
+        Changes the color of a node, updates it and marks it as dirty for the next clear
         :param color: tuple representing the color for the node to change to
         :param node: node to be modified
         :param r: row coordinates, in case a node is not provided
@@ -546,6 +846,7 @@ class Graph(object):
         time.sleep(DELAY)
         node.change_color(color)
         node.draw(screen)
+        self.dirty.add(node)
 
     def save_maze(self) -> None:
         """
@@ -590,14 +891,16 @@ class Graph(object):
                         n = self.nodes[i][j]
                         dig = int(dig)
                         if dig == 1:
-                            n.toggle_wall()
+                            self.toggle_wall(n)
                         elif dig == 2:
                             self.start_pos = (i, j)
                             n.toggle_start()
                         elif dig == 3:
                             n.toggle_dest()
                             self.dest_pos = (i, j)
-                        n.draw(screen)
+                # Redraw the whole grid on the next frame
+                self.full_redraw = True
+            self.refresh_landmarks()
         except FileNotFoundError:
             print(f"You don't have a maze{num}.txt file")
 
@@ -630,10 +933,11 @@ class Node(object):
         self.dest = False
         self.is_wall = False
 
-    def draw(self, s: pygame.surface) -> None:
+    def draw(self, s: pygame.surface, update: bool = True) -> None:
         """
         Draws the nodes onto the window with the specific color or as a wall nodes if drag has been toggled
         :param s: pygame surface to draw on
+        :param update: whether to update the node's region of the display right away
         :return: None
         """
         if self.wall_status():
@@ -644,7 +948,8 @@ class Node(object):
             pygame.draw.circle(s, self.sq_color, (self.x + self.w // 2, self.y + self.h // 2), 8)
         else:
             pygame.draw.rect(s, self.sq_color, self.rect)
-        pygame.display.update(self.rect)
+        if update:
+            pygame.display.update(self.rect)
 
     def change_color(self, color: tuple) -> None:
         """
@@ -683,6 +988,81 @@ class Node(object):
         self.sq_color = COLORS["BLACK"] if self.sq_color == COLORS["WHITE"] else COLORS["WHITE"]
 
 
+class SearchBuffer(object):
+    """
+    The SearchBuffer class holds preallocated flat arrays of distances, preceding nodes and found state for one
+    search direction. Entries are only valid when their stamp matches the current generation, so the buffer can be
+    reused across solves and reset in constant time
+    """
+
+    def __init__(self, rows: int, cols: int):
+        """
+        Creates a SearchBuffer object
+        :param rows: number of rows in the graph
+        :param cols: number of columns in the graph
+        """
+        self.cols = cols
+        self.generation = 1
+        self.dists = [0] * (rows * cols)
+        self.prevs = [None] * (rows * cols)
+        self.stamps = [0] * (rows * cols)
+        self.closed = [0] * (rows * cols)
+
+    def reset(self) -> None:
+        """
+        Invalidates every entry by starting a new generation
+        :return: None
+        """
+        self.generation += 1
+
+    def dist(self, pos: tuple) -> float:
+        """
+        Returns the distance of a position
+        :param pos: tuple of row and col indices
+        :return: distance of the position, infinity if it has not been reached in this generation
+        """
+        i = pos[0] * self.cols + pos[1]
+        return self.dists[i] if self.stamps[i] == self.generation else float('inf')
+
+    def prev(self, pos: tuple):
+        """
+        Returns the preceding position of a position
+        :param pos: tuple of row and col indices
+        :return: tuple of the preceding position, None if it has not been reached in this generation
+        """
+        i = pos[0] * self.cols + pos[1]
+        return self.prevs[i] if self.stamps[i] == self.generation else None
+
+    def update(self, pos: tuple, dist: float, prev) -> None:
+        """
+        Sets the distance and preceding position of a position
+        :param pos: tuple of row and col indices
+        :param dist: new distance of the position
+        :param prev: tuple of the preceding position
+        :return: None
+        """
+        i = pos[0] * self.cols + pos[1]
+        self.stamps[i] = self.generation
+        self.dists[i] = dist
+        self.prevs[i] = prev
+
+    def close(self, pos: tuple) -> None:
+        """
+        Marks a position as found
+        :param pos: tuple of row and col indices
+        :return: None
+        """
+        self.closed[pos[0] * self.cols + pos[1]] = self.generation
+
+    def is_closed(self, pos: tuple) -> bool:
+        """
+        Returns if a position has been found in this generation
+        :param pos: tuple of row and col indices
+        :return: True if it has been found, False if otherwise
+        """
+        return self.closed[pos[0] * self.cols + pos[1]] == self.generation
+
+
 def play() -> None:
     """
     Game loop for the pathfinder visualizer
@@ -704,9 +1084,14 @@ def play() -> None:
             if event.type == pygame.KEYDOWN and event.key == pygame.K_x:
                 pygame.quit()
                 sys.exit()
+            # Repaint the whole grid when the window was covered, minimized or restored
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                g.full_redraw = True
             # Let the graph handle the event
             g.handle_event(event)
 
+        # Paint the coalesced wall stroke once per frame
+        g.paint_stroke()
         g.draw(screen)
         clock.tick(30)
 
@@ -726,6 +1111,8 @@ def instructions() -> None:
     print("|      E = Run Double-Dijkstra's algorithm    |")
     print("|             A = Run A* algorithm            |")
     print("|           Q = Run Double A* algorithm       |")
+    print("|   L = Toggle ALT landmark heuristic for A*  |")
+    print("|    W = Run anytime A* within a time budget  |")
     print("|     S = Enable/disable a start position     |")
     print("|     D = Enable/disable an end position      |")
     print("|          C = Clear board completely         |")